@@ -1,10 +1,13 @@
 """Generate baseline schedules."""
 from collections import defaultdict
 
-import pulp
+import numpy as np
 from qiskit import QuantumCircuit
 
-from .types import Bin, JobHelper, JobResultInfo
+from .types import JobResultInfo
+
+# Capacity that ranks bins which don't fit behind all others
+_NO_FIT = np.iinfo(np.int32).max
 
 
 def generate_baseline_schedule(
@@ -13,93 +16,118 @@ def generate_baseline_schedule(
     process_times: list[list[float]],
     setup_times: list[list[list[float]]],
 ) -> tuple[float, list[JobResultInfo]]:
-    """Generate baseline schedule."""
-
-    def find_fitting_bin(job: JobHelper, bins: list[Bin]) -> int | None:
-        """Find a bin that fits the job.
-        
-        Args:
-            job: job to fit
-            bins: list of bins
-            
-        Returns:
-            index of the bin that fits the job
-        """
-        for idx, b in enumerate(bins):
-            if b.capacity >= job.instance.num_qubits:
-                return idx
-        return None
-
-    new_jobs = [JobHelper(str(idx + 1), job) for idx, job in enumerate(jobs)]               
-    open_bins = [
-        Bin(index=0, capacity=qpu, qpu=idx)
-        for idx, qpu in enumerate(accelerators.values())
+    """Generate baseline schedule.
+
+    Jobs are packed best-fit decreasing: largest jobs first, each into the open
+    bin with the least remaining capacity that still fits it.
+    The packing itself only works on qubit counts and runs in `_pack`.
+    Job names and the order of the returned jobs follow the input order, so
+    job "i" is row i - 1 of the processing times. Jobs in the same bin run in
+    that order as well, which decides the setup times and thus the makespan.
+    """
+    machines = list(accelerators.keys())
+    job_ids = [idx for idx, job in enumerate(jobs) if job is not None]
+    job_qubits = np.fromiter(
+        (jobs[idx].num_qubits for idx in job_ids),
+        dtype=np.int32,
+        count=len(job_ids),
+    )
+    qpu_caps = np.fromiter(
+        accelerators.values(), dtype=np.int32, count=len(accelerators)
+    )
+    # Stable sort keeps jobs of equal size in input order
+    order = np.argsort(-job_qubits, kind="stable")
+    bin_indices = np.empty_like(job_qubits)
+    qpu_indices = np.empty_like(job_qubits)
+    bin_indices[order], qpu_indices[order] = _pack(job_qubits[order], qpu_caps)
+
+    combined_jobs = [
+        JobResultInfo(
+            name=str(job_id + 1),
+            machine=machines[qpu],
+            start_time=bin_index,
+            completion_time=-1.0,
+            capacity=qubits,
+        )
+        for job_id, bin_index, qpu, qubits in zip(
+            job_ids, bin_indices.tolist(), qpu_indices.tolist(), job_qubits.tolist()
+        )
     ]
-    closed_bins = []
-    index = 1
-    for job in new_jobs:
-        if job is None or job.instance is None:
-            continue
-        # Find the index of a fitting bin
-        bin_idx = find_fitting_bin(job, open_bins)
-
-        if bin_idx is None:
-            # Open new bins
-            new_bins = [
-                Bin(index=index, capacity=qpu, qpu=idx)
-                for idx, qpu in enumerate(accelerators.values())
-            ]
-            index += 1
-
-            # Search for a fitting bin among the new ones
-            bin_idx = find_fitting_bin(job, new_bins)
-            assert bin_idx is not None, "Job doesn't fit onto any qpu"
-            bin_idx += len(open_bins)
-            open_bins += new_bins
-
-        # Add job to selected bin
-        selected_bin = open_bins[bin_idx]
-        selected_bin.jobs.append(job)
-        selected_bin.capacity -= job.instance.num_qubits
-
-        # Close bin if full
-        if selected_bin.capacity == 0:
-            selected_bin.full = True
-            closed_bins.append(selected_bin)
-            del open_bins[bin_idx]
-
-    # Close all open bins
-    for obin in open_bins:
-        if len(obin.jobs) > 0:
-            closed_bins.append(obin)
-
-    # Build combined jobs from bins
-    combined_jobs: list[JobResultInfo] = []
-    for _bin in sorted(closed_bins, key=lambda x: x.index):
-        # combined_jobs.append(ScheduledJob(job=assemble_job(_bin.jobs), qpu=_bin.qpu))
-        for job in _bin.jobs:
-            if job is None or job.instance is None:
-                continue
-            combined_jobs.append(
-                JobResultInfo(
-                    name=job.name,
-                    machine=list(accelerators.keys())[_bin.qpu],
-                    start_time=_bin.index,
-                    completion_time=-1.0,
-                    capacity=job.instance.num_qubits,
-                )
-            )
 
     return _calculate_result_from_baseline(
-        combined_jobs, process_times, setup_times, jobs, accelerators
+        combined_jobs, process_times, setup_times, accelerators
     )
 
 
+def _find_fitting_bin(caps: np.ndarray, start: int, stop: int, qubits: int) -> int:
+    """Find the smallest bin in caps[start:stop] that fits the job.
+
+    The search is vectorized, so it doesn't loop over the bins in python.
+
+    Args:
+        caps: remaining capacity per bin
+        start: first bin id to consider
+        stop: bin id after the last one to consider
+        qubits: number of qubits of the job
+
+    Returns:
+        id of the bin that fits the job, -1 if there is none
+    """
+    if start >= stop:
+        return -1
+    # Bins that don't fit rank behind all others, ties go to the lowest id
+    fitting = np.where(caps[start:stop] >= qubits, caps[start:stop], _NO_FIT)
+    candidate = np.argmin(fitting)
+    if fitting[candidate] == _NO_FIT:
+        return -1
+    return start + int(candidate)
+
+
+def _pack(qubits: np.ndarray, qpu_caps: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Pack jobs into bins, opening one bin per qpu whenever nothing fits.
+
+    Bins of index i are stored at [i * n_qpus, (i + 1) * n_qpus).
+
+    Args:
+        qubits: number of qubits per job, in packing order
+        qpu_caps: number of qubits per qpu
+
+    Returns:
+        bin index and qpu index per job
+    """
+    n_jobs = qubits.shape[0]
+    n_qpus = qpu_caps.shape[0]
+    # Every job opens at most one new index
+    caps = np.empty((n_jobs + 1) * n_qpus, dtype=np.int32)
+    caps[:n_qpus] = qpu_caps
+    n_bins = n_qpus
+    # All bins before first_open are full
+    first_open = 0
+    bin_indices = np.empty(n_jobs, dtype=np.int32)
+    qpu_indices = np.empty(n_jobs, dtype=np.int32)
+    for job in range(n_jobs):
+        while first_open < n_bins and caps[first_open] == 0:
+            first_open += 1
+        bin_id = _find_fitting_bin(caps, first_open, n_bins, qubits[job])
+
+        if bin_id < 0:
+            # Open new bins, only those can fit the job
+            caps[n_bins : n_bins + n_qpus] = qpu_caps
+            bin_id = _find_fitting_bin(caps, n_bins, n_bins + n_qpus, qubits[job])
+            n_bins += n_qpus
+            assert bin_id >= 0, "Job doesn't fit onto any qpu"
+
+        caps[bin_id] -= qubits[job]
+        bin_indices[job] = bin_id // n_qpus
+        qpu_indices[job] = bin_id % n_qpus
+
+    return bin_indices, qpu_indices
+
+
 def _calculate_result_from_baseline(
     jobs: list[JobResultInfo],
     process_times: list[list[float]],
     setup_times: list[list[list[float]]],
-    base_jobs: list[QuantumCircuit],
     accelerators: dict[str, int],
 ) -> tuple[float, list[JobResultInfo]]:
     """Calculate makespan and completion times from baseline schedule.
@@ -108,39 +136,33 @@ def _calculate_result_from_baseline(
         jobs: list of jobs
         process_times: processing times
         setup_times: setup times
-        base_jobs: base jobs
         accelerators: accelerators
         
     Returns:
         makespan and completion times
     """
-    
-    lp_jobs = ["0"] + [str(idx + 1) for idx, _ in enumerate(base_jobs)]
-    machines = list(accelerators.keys())
-    p_times = pulp.makeDict(
-        [lp_jobs[1:], machines],
-        process_times,
-        0,
-    )
-    s_times = pulp.makeDict(
-        [lp_jobs, lp_jobs, machines],
-        setup_times,
-        0,
-    )
+    machine_index = {machine: idx for idx, machine in enumerate(accelerators)}
+    p_times = np.asarray(process_times, dtype=np.float64)
+    s_times = np.asarray(setup_times, dtype=np.float64)
 
-    return _calculate_makespan(jobs, p_times, s_times), jobs
+    return _calculate_makespan(jobs, p_times, s_times, machine_index), jobs
 
 def _calculate_makespan(
     jobs: list[JobResultInfo],
-    p_times: defaultdict[str, defaultdict[str, float]],
-    s_times: defaultdict[str, defaultdict[str, defaultdict[str, float]]],
+    p_times: np.ndarray,
+    s_times: np.ndarray,
+    machine_index: dict[str, int],
 ) -> float:
     """Calculate makespan from job results.
+
+    Times are looked up by integer ids: job "i" is row i - 1 of p_times and
+    row i of s_times, where row 0 is the dummy job "0".
     
     Args:
         jobs: list of jobs
-        p_times: processing times
-        s_times: setup times
+        p_times: processing times, indexed by [job, machine]
+        s_times: setup times, indexed by [predecessor, job, machine]
+        machine_index: column of each machine in the time arrays
         
     Returns:
         makespan
@@ -150,6 +172,7 @@ def _calculate_makespan(
         assigned_machine[job.machine].append(job)
     makespans = []
     for machine, assigned_jobs in assigned_machine.items():
+        machine_id = machine_index[machine]
         for job in sorted(assigned_jobs, key=lambda x: x.start_time):
             # Find the last predecessor that is completed before the job starts
             # this can technically change the correct predecessor to a wrong one
@@ -159,13 +182,14 @@ def _calculate_makespan(
             if job.start_time == 0.0:
                 last_completed = JobResultInfo("0", machine, 0.0, 0.0)
             job.start_time = last_completed.completion_time
+            job_id = int(job.name)
             # calculate p_j + s_ij
             completion_time = ( # check if this order is correct
                 last_completed.completion_time
-                + p_times[job.name][machine]
-                + s_times[last_completed.name][job.name][machine]
+                + p_times[job_id - 1, machine_id]
+                + s_times[int(last_completed.name), job_id, machine_id]
             )     
-            job.completion_time = completion_time
+            job.completion_time = float(completion_time)
         makespans.append(max((job.completion_time for job in assigned_jobs)))
         
-    return max(makespans)
\ No newline at end of file
+    return max(makespans)
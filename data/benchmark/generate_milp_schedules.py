@@ -1,6 +1,8 @@
 """Helpers to generate MILP based schedules."""
 from collections import defaultdict
 from copy import deepcopy
+from functools import lru_cache
+import os
 
 import numpy as np
 import pulp
@@ -86,17 +88,17 @@ def generate_simple_schedule(
     lp_instance: LPInstance,
     process_times: list[list[float]],
     setup_times: list[list[list[float]]],
+    solver: pulp.LpSolver | None = None,
 ) -> tuple[float, list[JobResultInfo]]:
-    """Generates the simple schedule."""
-    p_times = pulp.makeDict(
-        [lp_instance.jobs[1:], lp_instance.machines],
-        process_times,
-        0,
-    )
-    s_times = pulp.makeDict(
-        [lp_instance.jobs[1:], lp_instance.machines],
+    """Generates the simple schedule.
+
+    Uses the given PuLP solver, by default Gurobi if available, else CBC.
+    """
+    p_times = _times_by_job(lp_instance.jobs[1:], lp_instance.machines, process_times)
+    s_times = _times_by_job(
+        lp_instance.jobs[1:],
+        lp_instance.machines,
         _get_simple_setup_times(setup_times),
-        0,
     )
 
     for job in lp_instance.jobs[1:]:
@@ -107,12 +109,8 @@ def generate_simple_schedule(
             * (p_times[job][machine] + s_times[job][machine])
             for machine in lp_instance.machines
         )
-    _, jobs = _solve_lp(lp_instance)
-    s_times = pulp.makeDict(
-        [lp_instance.jobs, lp_instance.jobs, lp_instance.machines],
-        setup_times,
-        0,
-    )
+    _, jobs = _solve_lp(lp_instance, solver)
+    s_times = _setup_times_by_jobs(lp_instance.jobs, lp_instance.machines, setup_times)
     return calculate_makespan(jobs, p_times, s_times), jobs
 
 
@@ -121,18 +119,14 @@ def generate_extended_schedule(
     process_times: list[list[float]],
     setup_times: list[list[list[float]]],
     big_m: int = 1000,
+    solver: pulp.LpSolver | None = None,
 ) -> tuple[float, list[JobResultInfo]]:
-    """Generates the extended schedule."""
-    p_times = pulp.makeDict(
-        [lp_instance.jobs[1:], lp_instance.machines],
-        process_times,
-        0,
-    )
-    s_times = pulp.makeDict(
-        [lp_instance.jobs, lp_instance.jobs, lp_instance.machines],
-        setup_times,
-        0,
-    )
+    """Generates the extended schedule.
+
+    Uses the given PuLP solver, by default Gurobi if available, else CBC.
+    """
+    p_times = _times_by_job(lp_instance.jobs[1:], lp_instance.machines, process_times)
+    s_times = _setup_times_by_jobs(lp_instance.jobs, lp_instance.machines, setup_times)
     # decision variables
     y_ijk = pulp.LpVariable.dicts(
         "y_ijk",
@@ -250,21 +244,33 @@ def generate_extended_schedule(
                     + d_ijk[job][job_j][machine]
                     - 2
                 )
-    _, jobs = _solve_lp(lp_instance)
+    _, jobs = _solve_lp(lp_instance, solver)
     return calculate_makespan(jobs, p_times, s_times), jobs
 
 
-def _solve_lp(lp_instance: LPInstance) -> tuple[float, list[JobResultInfo]]:
-    solver_list = pulp.listSolvers(onlyAvailable=True)
-    gurobi = "GUROBI_CMD"
-    if gurobi in solver_list:
-        solver = pulp.getSolver(gurobi)
-        lp_instance.problem.solve(solver)
-    else:
-        lp_instance.problem.solve()
+def _solve_lp(
+    lp_instance: LPInstance, solver: pulp.LpSolver | None = None
+) -> tuple[float, list[JobResultInfo]]:
+    if solver is None:
+        solver = _default_solver()
+    lp_instance.problem.solve(solver)
     return _generate_results(lp_instance)
 
 
+@lru_cache
+def _default_solver() -> pulp.LpSolver:
+    """Gurobi if available, else multi-threaded CBC, both without solver output.
+
+    No time limit is set: a time-limited solve can stop with a non-optimal or
+    partial assignment, leaving variables without a value, which the results
+    don't handle. Solvers passed in must run to a solution for the same reason.
+    """
+    gurobi = "GUROBI_CMD"
+    if gurobi in pulp.listSolvers(onlyAvailable=True):
+        return pulp.getSolver(gurobi, msg=False)
+    return pulp.PULP_CBC_CMD(msg=False, threads=os.cpu_count())
+
+
 def _generate_results(lp_instance: LPInstance) -> tuple[float, list[JobResultInfo]]:
     assigned_jobs = {
         job.name: JobResultInfo(name=job.name, capacity=job.instance.num_qubits)
@@ -288,8 +294,8 @@ def _generate_results(lp_instance: LPInstance) -> tuple[float, list[JobResultInf
 
 def calculate_makespan(
     jobs: list[JobResultInfo],
-    p_times: defaultdict[str, defaultdict[str, float]],
-    s_times: defaultdict[str, defaultdict[str, defaultdict[str, float]]],
+    p_times: dict[str, dict[str, float]],
+    s_times: dict[str, dict[str, dict[str, float]]],
 ) -> float:
     """Calculates the actual makespan from the list of jobs."""
     assigned_machines: defaultdict[str, list[JobResultInfo]] = defaultdict(list)
@@ -348,6 +354,29 @@ def calculate_makespan(
     return max(makespans)
 
 
+def _times_by_job(
+    jobs: list[str], machines: list[str], times: list[list[float]]
+) -> dict[str, dict[str, float]]:
+    """Keys times[job][machine] by job and machine name.
+
+    Like pulp.makeDict with default 0, machines missing in a row get time 0.
+    """
+    return {
+        job: dict.fromkeys(machines, 0) | dict(zip(machines, row))
+        for job, row in zip(jobs, times)
+    }
+
+
+def _setup_times_by_jobs(
+    jobs: list[str], machines: list[str], times: list[list[list[float]]]
+) -> dict[str, dict[str, dict[str, float]]]:
+    """Keys times[job_i][job_j][machine] by job and machine name."""
+    return {
+        job_i: {job_j: dict(zip(machines, row)) for job_j, row in zip(jobs, matrix)}
+        for job_i, matrix in zip(jobs, times)
+    }
+
+
 def _get_simple_setup_times(
     setup_times: list[list[list[float]]],
 ) -> list[list[float]]:
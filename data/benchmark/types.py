@@ -1,22 +1,11 @@
 """structures for bin packing and LP problems"""
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 from qiskit import QuantumCircuit
 import pulp
 
 
-@dataclass
-class Bin:
-    """Helper to keep track of binning problem."""
-    
-    capacity: int = 0                                           # capacity of the bin
-    full: bool = False                                          # whether the bin is full
-    index: int = -1                                             # index of the bin
-    jobs: list[QuantumCircuit] = field(default_factory=list)    # jobs in the bin
-    qpu: int = -1                                               # qpu index
-    
-    
-@dataclass
+@dataclass(slots=True)
 class JobHelper:
     """Helper to keep track of job names."""
     
@@ -36,7 +25,7 @@ class LPInstance:
     s_j: dict[str, pulp.LpVariable]                             # variables s_j: start time of job j: s_j = c_j - p_j
     instances: list[JobHelper]                                  # job instances 
 
-@dataclass
+@dataclass(slots=True)
 class JobResultInfo:
     """Helper to keep track of job results."""
     
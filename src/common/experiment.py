@@ -2,14 +2,19 @@
 Also contains functions to convert between them.
 """
 from dataclasses import dataclass, field
-from uuid import UUID, uuid4
+from itertools import count
+from uuid import UUID
 
 from circuit_knitting.cutting.qpd import WeightType
 from qiskit import QuantumCircuit
 from qiskit.quantum_info import PauliList
 
+# Session-local job ids, much cheaper than uuid4.
+# They can't collide with uuid4 ids, which always have the version bits set.
+_job_ids = count(1)
 
-@dataclass
+
+@dataclass(slots=True)
 class Experiment:
     """Data class for cut results.
     Contains the information for one partition.
@@ -24,7 +29,7 @@ class Experiment:
     uuid: UUID
 
 
-@dataclass
+@dataclass(slots=True)
 class CircuitJob:
     """Data class for single cicruit.
     The circuit is enriched with information for reconstruction.
@@ -41,7 +46,7 @@ class CircuitJob:
     uuid: UUID
 
 
-@dataclass
+@dataclass(slots=True)
 class CombinedJob:
     """Data class for combined circuit object.
     Order of the lists has to be correct for all!
@@ -58,7 +63,7 @@ class CombinedJob:
     result_counts: dict[str, int] | None = None
     uuids: list[UUID] = field(default_factory=list)
     
-@dataclass
+@dataclass(slots=True)
 class ScheduledJob:
     """Data class for scheduled job.
     Additionally includes which qpu to run on.
@@ -70,6 +75,8 @@ class ScheduledJob:
 
 def job_from_circuit(circuit: QuantumCircuit) -> CircuitJob:
     """Create a CircuitJob from a QuantumCircuit.
+
+    The uuid of the job is only unique within the running session.
     
     Args:
         circuit (QuantumCircuit): The circuit to create a job from.
@@ -86,7 +93,7 @@ def job_from_circuit(circuit: QuantumCircuit) -> CircuitJob:
         observable=PauliList(""),
         partition_label="1",
         result_counts=None,
-        uuid=uuid4(),
+        uuid=UUID(int=next(_job_ids)),
     )
     
 
@@ -99,18 +106,23 @@ def jobs_from_experiment(experiment: Experiment) -> list[CircuitJob]:
     Returns:
         list[CircuitJob]: List of CircuitJobs.
     """
+    coefficients = experiment.coefficients
+    n_shots = experiment.n_shots
+    observable = experiment.observables
+    partition_label = experiment.partition_label
+    uuid = experiment.uuid
     return [
         CircuitJob(
-            coefficient=experiment.coefficients[idx],
+            coefficient=coefficients[idx],
             cregs=len(circuit.cregs),
             index=idx,
             instance=circuit,
-            n_shots=experiment.n_shots,
+            n_shots=n_shots,
             # TODO this might need to change for proper observables
-            observable=experiment.observables,
-            partition_label=experiment.partition_label,
+            observable=observable,
+            partition_label=partition_label,
             result_counts=None,
-            uuid=experiment.uuid,
+            uuid=uuid,
         )
         for idx, circuit in enumerate(experiment.circuits)
     ]
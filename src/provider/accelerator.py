@@ -1,10 +1,357 @@
 """Wrapper for IBMs backend simulator."""
-from qiskit import QuantumCircuit, transpile
+from collections import OrderedDict
+from collections.abc import Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
+from hashlib import sha256
+import os
+from threading import Lock
+from typing import Any
+
+import numpy as np
+from qiskit import ClassicalRegister, QuantumCircuit, transpile
+from qiskit.circuit import (
+    Barrier,
+    BreakLoopOp,
+    ContinueLoopOp,
+    ForLoopOp,
+    IfElseOp,
+    Instruction,
+    WhileLoopOp,
+)
+from qiskit.circuit.exceptions import CircuitError
+from qiskit.circuit.library import get_standard_gate_name_mapping
+from qiskit.transpiler import Target
 from qiskit_aer import AerSimulator
 
 from src.common import IBMQBackend
 from src.tools import optimize_circuit_online, optimize_circuit_offline
 
+_NON_GATES = {"barrier", "delay", "measure", "reset"}
+# Operations that are fully described by their name and parameters
+_STANDARD_OPERATIONS = {
+    name: type(operation)
+    for name, operation in get_standard_gate_name_mapping().items()
+} | {"barrier": Barrier}
+# Control flow is described by its blocks, which are part of the parameters
+_CONTROL_FLOW = (IfElseOp, ForLoopOp, WhileLoopOp, BreakLoopOp, ContinueLoopOp)
+
+
+class _LRUCache:
+    """Thread-safe cache dropping the least recently used entries when full."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._maxsize = maxsize
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Gets a cached value and marks it as recently used.
+
+        Args:
+            key (Hashable): The key of the value.
+
+        Returns:
+            Any | None: The value or None if it isn't cached.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Caches a value, dropping the least recently used one if full.
+
+        Args:
+            key (Hashable): The key of the value.
+            value (Any): The value to cache.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+
+# Shared by all accelerators, keys include the backend name and calibration
+_processing_times = _LRUCache(maxsize=4096)
+_prepared_circuits = _LRUCache(maxsize=1024)
+
+
+def _circuit_key(circuit: QuantumCircuit) -> Hashable | None:
+    """Builds a hashable key from the structure of a circuit.
+
+    QuantumCircuit itself is not hashable. Circuits with the same registers and
+    the same instructions on the same bits get the same key, independent of
+    their name. Registers are part of the key since they shape the counts.
+    Instructions are keyed by name, parameters, duration and unit, custom gates
+    additionally by their definition and control flow by its blocks.
+    Circuits with anything else, e.g. opaque gates or calibrations, can't be
+    keyed reliably and get no key.
+
+    Args:
+        circuit (QuantumCircuit): The circuit to build the key for.
+
+    Returns:
+        Hashable | None: The key or None if the circuit can't be keyed.
+    """
+    try:
+        key = _structure_key(circuit)
+        hash(key)
+    except (TypeError, CircuitError):
+        return None
+    return key
+
+
+def _structure_key(circuit: QuantumCircuit) -> tuple:
+    """Builds the key of _circuit_key, raising if the circuit can't be keyed.
+
+    Args:
+        circuit (QuantumCircuit): The circuit to build the key for.
+
+    Raises:
+        TypeError: If the circuit contains something that can't be keyed.
+
+    Returns:
+        tuple: The key.
+    """
+    if circuit.calibrations:
+        raise TypeError("Can't key circuits with calibrations.")
+    return (
+        tuple((register.name, register.size) for register in circuit.qregs),
+        tuple((register.name, register.size) for register in circuit.cregs),
+        circuit.num_qubits,
+        circuit.num_clbits,
+        circuit.global_phase,
+        tuple(
+            (
+                _operation_key(instruction.operation),
+                tuple(circuit.find_bit(qubit).index for qubit in instruction.qubits),
+                tuple(circuit.find_bit(clbit).index for clbit in instruction.clbits),
+                _condition_key(
+                    circuit, getattr(instruction.operation, "condition", None)
+                ),
+            )
+            for instruction in circuit.data
+        ),
+    )
+
+
+def _operation_key(operation: Instruction) -> tuple:
+    """Builds the key of a single operation.
+
+    Args:
+        operation (Instruction): The operation to build the key for.
+
+    Raises:
+        TypeError: If the operation is opaque and not a standard instruction.
+
+    Returns:
+        tuple: The key.
+    """
+    name = operation.name
+    if isinstance(operation, _CONTROL_FLOW) or _STANDARD_OPERATIONS.get(name) is type(
+        operation
+    ):
+        definition = None
+    elif operation.definition is not None:
+        definition = _structure_key(operation.definition)
+    else:
+        raise TypeError(f"Can't key opaque instruction {name}.")
+    return (
+        name,
+        tuple(_param_key(param) for param in operation.params),
+        operation.duration,
+        operation.unit,
+        getattr(operation, "ctrl_state", None),
+        definition,
+    )
+
+
+def _param_key(param: Any) -> Hashable:
+    """Builds the key of an operation parameter.
+
+    Args:
+        param (Any): The parameter, control flow blocks are circuits.
+
+    Returns:
+        Hashable: The key.
+    """
+    if isinstance(param, QuantumCircuit):
+        return _structure_key(param)
+    if isinstance(param, np.ndarray):
+        return (param.shape, param.dtype.str, param.tobytes())
+    return param
+
+
+def _condition_key(circuit: QuantumCircuit, condition: Any) -> Hashable:
+    """Builds the key of a classical condition from the indices of its bits.
+
+    Args:
+        circuit (QuantumCircuit): The circuit containing the condition.
+        condition (Any): The condition, None if there is none.
+
+    Raises:
+        TypeError: If the condition isn't on a bit or register.
+
+    Returns:
+        Hashable: The key.
+    """
+    if condition is None:
+        return None
+    if not isinstance(condition, tuple):
+        raise TypeError("Can't key classical expressions.")
+    target, value = condition
+    if isinstance(target, ClassicalRegister):
+        return (tuple(circuit.find_bit(clbit).index for clbit in target), value)
+    return (circuit.find_bit(target).index, value)
+
+
+def _calibration_digest(target: Target) -> str:
+    """Digests the calibration data of a backend.
+
+    The backend version doesn't change with the calibration, so cached results
+    are keyed by this digest instead.
+
+    Args:
+        target (Target): The target of the backend.
+
+    Returns:
+        str: The digest, changes with dt and any gate or qubit property.
+    """
+    instructions = [
+        (name, qargs, props.duration, props.error)
+        for name in sorted(target.operation_names)
+        for qargs, props in sorted(target[name].items(), key=lambda item: str(item[0]))
+        if props is not None
+    ]
+    qubits = [
+        None if props is None else (props.t1, props.t2, props.frequency)
+        for props in target.qubit_properties or []
+    ]
+    return sha256(repr((target.dt, instructions, qubits)).encode()).hexdigest()
+
+
+def _estimate_duration(circuit: QuantumCircuit, target: Target) -> float:
+    """Estimates the duration of a circuit from the gate durations of a backend.
+
+    The circuit is not transpiled, but operations the target doesn't support
+    are expanded through their definitions. An instruction takes the duration
+    the target reports for it on the same qubits, otherwise the mean duration
+    of the instruction on the target. Gates that can't be expanded further take
+    the mean duration of the supported gates acting on as many qubits (or the
+    longest of those means for bigger gates). Barriers take no time and delays their own
+    duration. Instructions start as soon as all their qubits are free, so the
+    result is the length of the critical path.
+
+    Args:
+        circuit (QuantumCircuit): The circuit to estimate.
+        target (Target): The target of the backend.
+
+    Returns:
+        float: The estimated duration in s.
+    """
+    mean_durations: dict[str, float] = {}
+    gate_durations: dict[int, list[float]] = {}
+    for name in target.operation_names:
+        durations = [
+            (len(qargs), props.duration)
+            for qargs, props in target[name].items()
+            if qargs is not None and props is not None and props.duration is not None
+        ]
+        if len(durations) == 0:
+            continue
+        mean_durations[name] = sum(d for _, d in durations) / len(durations)
+        if name not in _NON_GATES:
+            gate_durations.setdefault(durations[0][0], []).append(mean_durations[name])
+    arity_durations = {
+        arity: sum(durations) / len(durations)
+        for arity, durations in gate_durations.items()
+    }
+
+    expansions: dict[Hashable, list[tuple[Instruction, tuple[int, ...]]]] = {}
+    qubit_times = [0.0] * circuit.num_qubits
+    for instruction in circuit.data:
+        qubits = tuple(circuit.find_bit(qubit).index for qubit in instruction.qubits)
+        if len(qubits) == 0:
+            continue
+        for operation, operation_qubits in _expand_operation(
+            instruction.operation, target, expansions
+        ):
+            qargs = tuple(qubits[qubit] for qubit in operation_qubits)
+            if len(qargs) == 0:
+                continue
+            name = operation.name
+            props = target[name].get(qargs) if name in target else None
+            start = max(qubit_times[qubit] for qubit in qargs)
+            if name == "barrier":
+                duration = 0.0
+            elif name == "delay":
+                duration = Accelerator._time_conversion(
+                    float(operation.params[0]), operation.unit, "s", dt=target.dt
+                )
+            elif props is not None and props.duration is not None:
+                duration = props.duration
+            elif name in mean_durations:
+                duration = mean_durations[name]
+            else:
+                duration = arity_durations.get(
+                    len(qargs), max(arity_durations.values(), default=0.0)
+                )
+            for qubit in qargs:
+                qubit_times[qubit] = start + duration
+    return max(qubit_times, default=0.0)
+
+
+def _expand_operation(
+    operation: Instruction,
+    target: Target,
+    expansions: dict[Hashable, list[tuple[Instruction, tuple[int, ...]]]],
+) -> list[tuple[Instruction, tuple[int, ...]]]:
+    """Expands an operation into operations the target supports.
+
+    Operations the target doesn't support are replaced by their definition,
+    recursively. Operations without a definition are kept as they are.
+
+    Args:
+        operation (Instruction): The operation to expand.
+        target (Target): The target of the backend.
+        expansions (dict[Hashable, list[tuple[Instruction, tuple[int, ...]]]]):
+        Memoized expansions by operation key, updated in place.
+
+    Returns:
+        list[tuple[Instruction, tuple[int, ...]]]: The expanded operations and
+        their qubits, as indices into the qubits of the operation.
+    """
+    if (
+        operation.name in target
+        or operation.name in _NON_GATES
+        or operation.definition is None
+    ):
+        return [(operation, tuple(range(operation.num_qubits)))]
+    try:
+        key = _operation_key(operation)
+        hash(key)
+    except (TypeError, CircuitError):
+        key = None
+    if key is not None and key in expansions:
+        return expansions[key]
+
+    definition = operation.definition
+    expanded = []
+    for instruction in definition.data:
+        qubits = tuple(definition.find_bit(qubit).index for qubit in instruction.qubits)
+        expanded.extend(
+            (sub_operation, tuple(qubits[qubit] for qubit in sub_qubits))
+            for sub_operation, sub_qubits in _expand_operation(
+                instruction.operation, target, expansions
+            )
+        )
+    if key is not None:
+        expansions[key] = expanded
+    return expanded
+
 
 class Accelerator:
     """Wrapper for a single backend simulator."""
@@ -12,9 +359,13 @@ class Accelerator:
     def __init__(
         self, backend: IBMQBackend, shot_time: int = 1, reconfiguration_time: int = 0
     ) -> None:
-        self.simulator = AerSimulator.from_backend(backend.value())
         self._backend = backend
-        self._qubits = len(self.simulator.properties().qubits)
+        # backend.value() instantiates a new fake backend, only do it once
+        self._backend_value = backend.value()
+        self._target = self._backend_value.target
+        self._qubits = self._backend_value.num_qubits
+        # Cached results are only valid for the same backend calibration
+        self._cache_key = (backend.name, _calibration_digest(self._target))
         self._shot_time = shot_time
         self._reconfiguration_time = reconfiguration_time
         
@@ -54,24 +405,96 @@ class Accelerator:
         required_shift = 3 * (target_shift - current_shift)
         return time * 10**required_shift   
 
-    def compute_processing_time(self, circuit: QuantumCircuit) -> float:
+    def compute_processing_time(
+        self, circuit: QuantumCircuit, approximate: bool = False
+    ) -> float:
         """Computes the processing time for the circuit for a single shot.
 
+        Results are cached per circuit structure and backend across all
+        accelerators, the least recently used entries are dropped once the cache
+        is full. Circuits that can't be keyed reliably are not cached.
         Args:
             circuit (QuantumCircuit): The circuit to analyze.
+            approximate (bool, optional): Estimate the time from the gate durations
+            of the backend instead of doing a full hardware-aware compilation.
+            Much faster, but ignores routing and layout. Defaults to False.
 
         Returns:
             float: The processing time in µs.
         """
-        # TODO: doing a full hardware-aware compilation just to get the processing
-        # time is not efficient. An approximation would be better.
-        be = self._backend.value()
-        transpiled_circuit = transpile(
-            circuit, be, scheduling_method="alap"
-        )
-        return Accelerator._time_conversion(
-            transpiled_circuit.duration, transpiled_circuit.unit, dt=be.dt
-        )
+        circuit_key = _circuit_key(circuit)
+        key = (circuit_key, self._cache_key, approximate)
+        processing_time = None if circuit_key is None else _processing_times.get(key)
+        if processing_time is not None:
+            return processing_time
+
+        if approximate:
+            processing_time = Accelerator._time_conversion(
+                _estimate_duration(circuit, self._target), "s"
+            )
+        else:
+            transpiled_circuit = transpile(
+                circuit, self._backend_value, scheduling_method="alap"
+            )
+            processing_time = Accelerator._time_conversion(
+                transpiled_circuit.duration,
+                transpiled_circuit.unit,
+                dt=self._backend_value.dt,
+            )
+        if circuit_key is not None:
+            _processing_times.put(key, processing_time)
+        return processing_time
+
+    @staticmethod
+    def compute_many(
+        accelerators: list["Accelerator"],
+        circuits: list[QuantumCircuit],
+        approximate: bool = False,
+    ) -> np.ndarray:
+        """Computes the processing times of all circuits on all accelerators.
+
+        The computations run in a thread pool, equal circuits on the same backend
+        are only computed once.
+        Args:
+            accelerators (list[Accelerator]): The accelerators to compute the times for.
+            circuits (list[QuantumCircuit]): The circuits to analyze.
+            approximate (bool, optional): Estimate the times instead of doing a full
+            hardware-aware compilation, see compute_processing_time.
+            Defaults to False.
+
+        Returns:
+            np.ndarray: The processing times in µs, indexed by [accelerator, circuit].
+        """
+        circuit_keys = [_circuit_key(circuit) for circuit in circuits]
+        futures: dict[Hashable, Future[float]] = {}
+        cells: list[tuple[int, int, Future[float]]] = []
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for row, accelerator in enumerate(accelerators):
+                for col, circuit in enumerate(circuits):
+                    # Circuits without a key are never shared
+                    key = (circuit_keys[col], accelerator._cache_key)
+                    future = None if circuit_keys[col] is None else futures.get(key)
+                    if future is None:
+                        future = executor.submit(
+                            accelerator.compute_processing_time, circuit, approximate
+                        )
+                        if circuit_keys[col] is not None:
+                            futures[key] = future
+                    cells.append((row, col, future))
+
+        times = np.empty((len(accelerators), len(circuits)))
+        for row, col, future in cells:
+            times[row, col] = future.result()
+        return times
+
+    @cached_property
+    def simulator(self) -> AerSimulator:
+        """The simulator for the backend, created on first use.
+
+        Returns:
+            AerSimulator: The simulator.
+        """
+        return AerSimulator.from_backend(self._backend_value)
 
     @property
     def shot_time(self) -> int:
@@ -109,12 +532,39 @@ class Accelerator:
         """
         return self._backend
 
+    def prepare(self, circuit: QuantumCircuit) -> QuantumCircuit:
+        """Optimizes a circuit for this backend ahead of running it.
+
+        The optimized circuit is cached per circuit structure and backend across
+        all accelerators, running the input or the returned circuit afterwards
+        doesn't optimize it again. Each call returns a new copy, so changing it
+        doesn't affect the cache.
+        Args:
+            circuit (QuantumCircuit): The circuit to optimize.
+
+        Returns:
+            QuantumCircuit: The optimized circuit.
+        """
+        circuit_key = _circuit_key(circuit)
+        if circuit_key is None:
+            return optimize_circuit_online(circuit, self._backend)
+        key = (circuit_key, self._cache_key)
+        prepared = _prepared_circuits.get(key)
+        if prepared is None:
+            prepared = optimize_circuit_online(circuit, self._backend)
+            _prepared_circuits.put(key, prepared)
+            prepared_key = _circuit_key(prepared)
+            if prepared_key is not None:
+                _prepared_circuits.put((prepared_key, self._cache_key), prepared)
+        return prepared.copy()
+
     def run_and_get_counts(
         self, circuit: QuantumCircuit, n_shots: int = 2**10
     ) -> dict[str, int]:
         """Run a circuit and get the measurment counts.
 
         The circuit is optimized before running, using the now available backend information.
+        Use prepare to do the optimization ahead of time.
         Args:
             circuit (QuantumCircuit): The circuit to run.
             n_shots (int, optional): Number of shots. Defaults to 2**10.
@@ -123,7 +573,37 @@ class Accelerator:
             dict[str, int]: Measurment counts.
         """
         # TODO check qubit size
-        circuit = optimize_circuit_online(circuit, self._backend)
-        # TODO For some reason the above line blocks
+        circuit = self.prepare(circuit)
         result = self.simulator.run(circuit, shots=n_shots).result()
         return result.get_counts(0)
+
+    def run_many_and_get_counts(
+        self,
+        circuits: list[QuantumCircuit],
+        n_shots: int = 2**10,
+        max_parallel_threads: int = 0,
+    ) -> list[dict[str, int]]:
+        """Run multiple circuits in a single submission and get the measurment counts.
+
+        The circuits are optimized like in run_and_get_counts and then submitted
+        together, so the simulator can run them in parallel.
+        Args:
+            circuits (list[QuantumCircuit]): The circuits to run.
+            n_shots (int, optional): Number of shots per circuit. Defaults to 2**10.
+            max_parallel_threads (int, optional): Number of threads the simulator
+            may use for the batch, 0 uses all available ones. Defaults to 0.
+
+        Returns:
+            list[dict[str, int]]: Measurment counts, preserving order.
+        """
+        if len(circuits) == 0:
+            return []
+        circuits = [self.prepare(circuit) for circuit in circuits]
+        # max_parallel_experiments=0 spreads the circuits over all allowed threads
+        result = self.simulator.run(
+            circuits,
+            shots=n_shots,
+            max_parallel_experiments=0,
+            max_parallel_threads=max_parallel_threads,
+        ).result()
+        return [result.get_counts(idx) for idx in range(len(circuits))]
@@ -1,6 +1,7 @@
 """A common interface for multiple accelerators."""
-from itertools import zip_longest
-from multiprocessing import Pool, current_process
+from collections import defaultdict
+from multiprocessing import get_context
+import os
 
 from qiskit import QuantumCircuit
 
@@ -63,26 +64,31 @@ class AcceleratorGroup:
     def run_jobs(self, jobs: list[ScheduledJob]) -> list[CombinedJob]:
         """Runs a list of scheduled jobs on their respective accelerators.
 
-        Creates a tuple of jobs to run at the same time onf different qpus.
-        Jobs are run in parallel.
+        The jobs of each qpu are submitted to its accelerator in batches.
+        Accelerators are run in parallel.
         Args:
             jobs (list[ScheduledJob]): The jobs to run.
 
         Returns:
-            list[ScheduledJob]: The jobs with results inserted.
+            list[CombinedJob]: The jobs with results inserted, ordered by qpu.
         """
         jobs_per_qpu = {
-            qpu: [job for job in jobs if job.qpu == qpu]
+            qpu: [job.job for job in jobs if job.qpu == qpu]
             for qpu, _ in enumerate(self.accelerators)
         }   # Sort by qpu
-        with Pool(processes=len(self._accelerators)) as pool:
-            results = []
-            for job in zip_longest(*jobs_per_qpu.values(), fillvalue=None): # Run jobs in parallel
-                result = pool.apply_async(_run_job, [self._accelerators, tuple(job)])
-                results.append(result)
-            print(f"1 len(results): {len(results)}")
-            results = [result.get() for result in results if result is not None]  
-            print(f"2 len(results): {len(results)}")
+        # Split the threads between the accelerators running at the same time
+        max_parallel_threads = max(1, (os.cpu_count() or 1) // len(self._accelerators))
+        # Forked workers deadlock in the transpiler's thread pool, so spawn them
+        with get_context("spawn").Pool(processes=len(self._accelerators)) as pool:
+            results = [
+                pool.apply_async(
+                    _run_jobs, [accelerator, qpu_jobs, max_parallel_threads]
+                )
+                for accelerator, qpu_jobs in zip(
+                    self._accelerators, jobs_per_qpu.values()
+                )
+            ]
+            results = [job for result in results for job in result.get()]
         return results
 
     def run_experiments(self, experiments: list[Experiment]) -> list[Experiment]:
@@ -125,40 +131,40 @@ def _run_func(accs: list[Accelerator], exp: Experiment) -> Experiment:
     """
     # pool_id = current_process()._identity[0] - 1 # TODO fix somehow
     try:         
-        exp.result_counts = [
-            accs[0].run_and_get_counts(circuit) for circuit in exp.circuits
-        ]
+        exp.result_counts = accs[0].run_many_and_get_counts(exp.circuits)
     except Exception as exc:
         # To make result.get() work deterministically
         print(exc)
         
     return exp
 
-def _run_job(
-    accs: list[Accelerator], jobs: tuple[CombinedJob | None]
-) -> CombinedJob | None:
-    """Selects a job from a tuple of jobs and runs it on the respective accelerator.
+def _run_jobs(
+    acc: Accelerator, jobs: list[CombinedJob], max_parallel_threads: int
+) -> list[CombinedJob]:
+    """Runs jobs on a single accelerator.
+
+    Jobs with the same number of shots are submitted together.
 
     Args:
-        accs (list[Accelerator]): the internal accelerators.
-        jobs (tuple[CombinedJob  |  None]): The jobs which are run in parallel.
+        acc (Accelerator): The accelerator to run the jobs on.
+        jobs (list[CombinedJob]): The jobs to run.
+        max_parallel_threads (int): Number of threads the accelerator may use.
 
     Returns:
-        CombinedJob | None: Returns the job with results inserted or None if no job was submited.
+        list[CombinedJob]: The jobs with results inserted.
     """
-    print(f"current_process()._identity: {current_process()._identity}")
-    pool_id = current_process()._identity[0] - 3  # TODO fix somehow
-    print(f"Pool ID: {pool_id}")
-    print(f"3 len(jobs): {len(jobs)}")
-    if pool_id >= len(jobs):
-        return None
-    
-    job = jobs[pool_id]
-    if job is None:
-        return None
-    job = job.job
-    try:
-        job.result_counts = accs[pool_id].run_and_get_counts(job.instance, job.n_shots)
-    except Exception as exc:
-        print(exc)
-    return job
\ No newline at end of file
+    jobs_per_shots: defaultdict[int, list[CombinedJob]] = defaultdict(list)
+    for job in jobs:
+        jobs_per_shots[job.n_shots].append(job)
+    for n_shots, batch in jobs_per_shots.items():
+        try:
+            counts = acc.run_many_and_get_counts(
+                [job.instance for job in batch], n_shots, max_parallel_threads
+            )
+        except Exception as exc:
+            # To make result.get() work deterministically
+            print(exc)
+            continue
+        for job, result_counts in zip(batch, counts):
+            job.result_counts = result_counts
+    return jobs
@@ -16,7 +16,7 @@ from .accelerator import Accelerator
 from .accelerator_group import AcceleratorGroup
 
 
-@dataclass
+@dataclass(slots=True)
 class Bin:
     """Helper to keep track of binning problem."""
 
@@ -76,13 +76,11 @@ class Scheduler:
             key=lambda x: x.instance.num_qubits,
             reverse=True,
         )
-        bins = self._binpacking_to_qpus(jobs)
-        combined_jobs = []
-        for _bin in sorted(bins, key=lambda x: x.index):
-            combined_jobs.append(
-                ScheduledJob(job=assemble_job(_bin.jobs), qpu=_bin.qpu)
-            )
-        return combined_jobs
+        # Bins are already ordered by index
+        return [
+            ScheduledJob(job=assemble_job(_bin.jobs), qpu=_bin.qpu)
+            for _bin in self._binpacking_to_qpus(jobs)
+        ]
 
     def _binpacking_to_qpus(self, jobs: list[CircuitJob]) -> list[Bin]:
         """Schedule jobs onto qpus.
@@ -97,51 +95,48 @@ class Scheduler:
             jobs (list[CircuitJob]): The list of jobs to run.
 
         Returns:
-            list[Bin]: All bins with at least one jobs.
+            list[Bin]: All bins with at least one jobs, ordered by index.
         """
         # Use binpacking to combine circuits into qpu sized jobs
         # placeholder for propper scheduling
         # TODO set a flag when an experiment is done
         # TODO consider number of shots
         # Assumption: beens should be equally loaded and take same amoutn of time
+        qpu_qubits = self.accelerator.qpus
         open_bins = [
-            Bin(index=0, capacity=qpu.qubits, qpu=idx)
-            for idx, qpu in enumerate(self.accelerator.accelerators)
+            Bin(index=0, capacity=qubits, qpu=idx)
+            for idx, qubits in enumerate(qpu_qubits)
         ]
-        closed_bins = []
+        bins = list(open_bins)  # all bins in order of creation, i.e. by index
         index = 1
         for job in jobs:
-            for obin in open_bins:
+            for bin_idx, obin in enumerate(open_bins):
                 # TODO consider 1 free qubit remaining
                 if obin.capacity >= job.instance.num_qubits:
                     obin.jobs.append(job)
                     obin.capacity -= job.instance.num_qubits
                     if obin.capacity <= 1:
                         obin.full = True
-                        closed_bins.append(obin)
-                        open_bins.remove(obin)
+                        del open_bins[bin_idx]
                     break
             else:
                 new_bins = [
-                    Bin(index=index, capacity=qpu.qubits, qpu=idx)
-                    for idx, qpu in enumerate(self.accelerator.accelerators)
+                    Bin(index=index, capacity=qubits, qpu=idx)
+                    for idx, qubits in enumerate(qpu_qubits)
                 ]
                 index += 1
-                for nbin in new_bins:
+                bins.extend(new_bins)
+                for bin_idx, nbin in enumerate(new_bins):
                     # TODO consider 1 free qubit remaining
                     if nbin.capacity >= job.instance.num_qubits:
                         nbin.jobs.append(job)
                         nbin.capacity -= job.instance.num_qubits
                         if nbin.capacity == 0:
                             nbin.full = True
-                            closed_bins.append(nbin)
-                            new_bins.remove(nbin)
+                            del new_bins[bin_idx]
                         break
-                open_bins += new_bins
-        for obin in open_bins:
-            if len(obin.jobs) > 0:
-                closed_bins.append(obin)
-        return closed_bins
+                open_bins.extend(new_bins)
+        return [_bin for _bin in bins if len(_bin.jobs) > 0]
 
     def _convert_to_jobs(self, circuits: list[QuantumCircuit]) -> list[CircuitJob]:
         """Generates jobs from circuits.
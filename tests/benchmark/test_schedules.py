@@ -0,0 +1,62 @@
+"""Benchmark schedule generation tests."""
+import pulp
+import pytest
+from qiskit import QuantumCircuit
+
+pytest.importorskip("data.benchmark")  # Skip without the benchmark dependencies
+
+from data.benchmark.generate_baseline_schedules import generate_baseline_schedule
+from data.benchmark.generate_milp_schedules import (
+    _get_simple_setup_times,
+    _setup_times_by_jobs,
+    _times_by_job,
+)
+
+
+def test_generate_baseline_schedule() -> None:
+    """Test bin assignments and makespan of the baseline schedule."""
+    accelerators = {"a": 5, "b": 3}
+    jobs = [QuantumCircuit(qubits) for qubits in [2, 5, 3, 1, 2]]
+    process_times = [[idx + 1.0] * 2 for idx in range(len(jobs))]
+    setup_times = [[[0.5] * 2] * (len(jobs) + 1)] * (len(jobs) + 1)
+    makespan, results = generate_baseline_schedule(
+        jobs, accelerators, process_times, setup_times
+    )
+    # Packed 5, 3, 2, 2, 1: bin 0 -> a: 2, b: 3; bin 1 -> a: 5, b: 1, 4
+    assert [result.name for result in results] == ["1", "2", "3", "4", "5"]
+    assert [result.machine for result in results] == ["b", "a", "b", "b", "a"]
+    # Jobs of a machine run by bin, then in input order
+    assert [result.completion_time for result in results] == [5.0, 2.5, 3.5, 9.5, 8.0]
+    assert makespan == 9.5
+
+
+def test_times_by_job() -> None:
+    """Test the time lookups against pulp.makeDict."""
+    jobs = ["1", "2", "3"]
+    machines = ["a", "b", "c"]
+    times = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [7.0, 8.0, 9.0]]
+    setup_times = [
+        [[float(i + j + k) for k in range(3)] for j in range(4)] for i in range(4)
+    ]
+    # Rows are one machine short, missing machines default to 0
+    simple_setup_times = _get_simple_setup_times(setup_times)
+    assert all(len(row) < len(machines) for row in simple_setup_times)
+
+    for values in (times, simple_setup_times):
+        expected = pulp.makeDict([jobs, machines], values, 0)
+        actual = _times_by_job(jobs, machines, values)
+        assert all(
+            actual[job][machine] == expected[job][machine]
+            for job in jobs
+            for machine in machines
+        )
+
+    all_jobs = ["0"] + jobs
+    expected = pulp.makeDict([all_jobs, all_jobs, machines], setup_times, 0)
+    actual = _setup_times_by_jobs(all_jobs, machines, setup_times)
+    assert all(
+        actual[job_i][job_j][machine] == expected[job_i][job_j][machine]
+        for job_i in all_jobs
+        for job_j in all_jobs
+        for machine in machines
+    )
@@ -1,9 +1,12 @@
 """Tests for Accelerator."""
 
-from pytest import approx
+from pytest import MonkeyPatch, approx
+from qiskit import QuantumCircuit, transpile
 
 from src.circuits import create_ghz
 from src.provider import Accelerator, IBMQBackend
+from src.provider import accelerator as accelerator_module
+from src.provider.accelerator import _calibration_digest, _LRUCache
 from src.tools import optimize_circuit_offline
 
 
@@ -17,3 +20,190 @@ def test_accelerator_run() -> None:
     assert len(counts) == 2**3                              # Check the number of counts
     assert counts["000"] / 1024 == approx(0.5, 0.2)         # Check the counts
     assert counts["111"] / 1024 == approx(0.5, 0.2)         # Check the counts
+
+
+def test_accelerator_processing_time_cached(monkeypatch: MonkeyPatch) -> None:
+    """Test that equal circuits reuse the computed processing time."""
+    transpiled = []
+
+    def counting_transpile(circuit, *args, **kwargs):
+        transpiled.append(circuit)
+        return transpile(circuit, *args, **kwargs)
+
+    monkeypatch.setattr(accelerator_module, "_processing_times", _LRUCache(16))
+    monkeypatch.setattr(accelerator_module, "transpile", counting_transpile)
+    accelerator = Accelerator(IBMQBackend.BELEM)
+    circuit = create_ghz(3)
+    processing_time = accelerator.compute_processing_time(circuit)
+    assert processing_time > 0                              # Check the time is set
+    assert accelerator.compute_processing_time(circuit.copy()) == processing_time
+    assert len(transpiled) == 1                             # Equal circuits reuse it
+    accelerator.compute_processing_time(create_ghz(2))
+    assert len(transpiled) == 2                             # Other circuits don't
+
+
+def test_accelerator_processing_time_delay_unit() -> None:
+    """Test that delays in different units don't share a cached time."""
+    accelerator = Accelerator(IBMQBackend.BELEM)
+    circuit_us, circuit_ns = QuantumCircuit(1), QuantumCircuit(1)
+    circuit_us.delay(100, 0, unit="us")
+    circuit_ns.delay(100, 0, unit="ns")
+    time_us = accelerator.compute_processing_time(circuit_us)
+    time_ns = accelerator.compute_processing_time(circuit_ns)
+    assert time_us == approx(100)                           # Units are part of the key
+    assert time_ns == approx(0.1)
+
+
+def test_accelerator_processing_time_custom_gate() -> None:
+    """Test that custom gates with the same name don't share a cached time."""
+    accelerator = Accelerator(IBMQBackend.BELEM)
+    circuits = []
+    for gates in (["h"], ["h", "cx"]):
+        definition = QuantumCircuit(2, name="u_custom")     # Same name, other gates
+        for gate in gates:
+            getattr(definition, gate)(*range(len(gate)))
+        circuit = QuantumCircuit(2)
+        circuit.append(definition.to_gate(), [0, 1])
+        circuits.append(circuit)
+    accelerator.compute_processing_time(circuits[0])        # Cache the first gate
+    assert accelerator.compute_processing_time(circuits[1]) == approx(
+        accelerator.compute_processing_time(circuits[1].decompose())
+    )
+
+
+def test_accelerator_processing_time_control_flow() -> None:
+    """Test computing the processing time of circuits with control flow."""
+    accelerator = Accelerator(IBMQBackend.BELEM)
+    circuit = QuantumCircuit(2, 1)
+    circuit.h(0)
+    circuit.measure(0, 0)
+    with circuit.if_test((circuit.clbits[0], 1)):
+        circuit.x(1)
+    assert accelerator.compute_processing_time(circuit, approximate=True) > 0
+
+
+def test_accelerator_calibration_digest() -> None:
+    """Test that the cache key follows the backend calibration."""
+    target = IBMQBackend.BELEM.value().target
+    digest = _calibration_digest(target)
+    assert _calibration_digest(IBMQBackend.BELEM.value().target) == digest
+    target["x"][(0,)].duration *= 2                         # Recalibrate a gate
+    assert _calibration_digest(target) != digest
+
+
+def test_accelerator_processing_time_approximate() -> None:
+    """Test estimating the processing time without transpiling."""
+    accelerator = Accelerator(IBMQBackend.BELEM)
+    circuit = create_ghz(3)
+    processing_time = accelerator.compute_processing_time(circuit)
+    approximate_time = accelerator.compute_processing_time(circuit, approximate=True)
+    assert approximate_time == approx(processing_time, 0.5)  # Check the estimate
+
+
+def test_accelerator_processing_time_approximate_order() -> None:
+    """Test that the estimate keeps the order of circuits with unsupported gates."""
+    accelerator = Accelerator(IBMQBackend.BELEM)
+    toffolis, cnots = QuantumCircuit(3), QuantumCircuit(3)
+    toffolis.ccx(0, 1, 2)                                   # Not supported by BELEM
+    toffolis.ccx(2, 1, 0)
+    for _ in range(2):
+        cnots.cx(0, 1)
+        cnots.cx(1, 2)
+    circuits = (toffolis, cnots)
+    exact = [accelerator.compute_processing_time(circuit) for circuit in circuits]
+    approximate = [
+        accelerator.compute_processing_time(circuit, approximate=True)
+        for circuit in circuits
+    ]
+    assert exact[0] > exact[1]                              # Toffolis decompose to more cx
+    assert approximate[0] > approximate[1]                  # Estimate keeps the order
+
+
+def test_accelerator_processing_time_approximate_delay() -> None:
+    """Test that the estimate uses the duration of delays."""
+    accelerator = Accelerator(IBMQBackend.BELEM)
+    circuit = create_ghz(2).copy()                          # create_ghz is cached
+    circuit.delay(100, 0, unit="us")
+    processing_time = accelerator.compute_processing_time(circuit)
+    approximate_time = accelerator.compute_processing_time(circuit, approximate=True)
+    assert approximate_time == approx(processing_time, 0.05)  # Dominated by the delay
+
+
+def test_accelerator_run_many() -> None:
+    """Test running multiple circuits in one submission."""
+    backend = IBMQBackend.BELEM
+    accelerator = Accelerator(backend)
+    circuits = [
+        optimize_circuit_offline(create_ghz(size), backend) for size in (2, 3)
+    ]
+    counts = accelerator.run_many_and_get_counts(circuits)
+    assert len(counts) == 2                                 # One result per circuit
+    assert counts[0]["00"] / 1024 == approx(0.5, 0.2)       # Check the counts
+    assert counts[1]["111"] / 1024 == approx(0.5, 0.2)      # Check the counts
+
+
+def test_accelerator_prepare(monkeypatch: MonkeyPatch) -> None:
+    """Test optimizing a circuit ahead of running it."""
+    optimized = []
+    optimize_circuit_online = accelerator_module.optimize_circuit_online
+
+    def counting_optimize(circuit, backend):
+        optimized.append(circuit)
+        return optimize_circuit_online(circuit, backend)
+
+    monkeypatch.setattr(accelerator_module, "_prepared_circuits", _LRUCache(16))
+    monkeypatch.setattr(
+        accelerator_module, "optimize_circuit_online", counting_optimize
+    )
+    backend = IBMQBackend.BELEM
+    accelerator = Accelerator(backend)
+    circuit = optimize_circuit_offline(create_ghz(3), backend)
+    prepared = accelerator.prepare(circuit)
+    assert accelerator.prepare(circuit.copy()) == prepared
+    assert len(optimized) == 1                              # Optimized only once
+    assert accelerator.prepare(prepared) == prepared
+    assert len(optimized) == 1                              # Not optimized again
+    assert Accelerator(backend).prepare(circuit) == prepared
+    assert len(optimized) == 1                              # Shared across instances
+    assert accelerator.prepare(circuit) is not prepared     # Callers get copies
+    counts = accelerator.run_and_get_counts(circuit)
+    assert len(optimized) == 1                              # Running reuses it
+    assert counts["000"] / 1024 == approx(0.5, 0.2)         # Check the counts
+
+
+def test_accelerator_prepare_custom_gate() -> None:
+    """Test that custom gates with the same name run their own definition."""
+    accelerator = Accelerator(IBMQBackend.BELEM)
+    counts = []
+    for gate in ("x", "h"):
+        definition = QuantumCircuit(1, name="u_custom")     # Same name, other gates
+        getattr(definition, gate)(0)
+        circuit = QuantumCircuit(1, 1)
+        circuit.append(definition.to_gate(), [0])
+        circuit.measure(0, 0)
+        counts.append(accelerator.run_and_get_counts(circuit))
+    assert counts[0]["1"] / 1024 == approx(1, 0.2)          # X flips the qubit
+    assert counts[1]["1"] / 1024 == approx(0.5, 0.2)        # H creates a superposition
+
+
+def test_accelerator_compute_many(monkeypatch: MonkeyPatch) -> None:
+    """Test computing processing times for multiple circuits and accelerators."""
+    accelerators = [Accelerator(IBMQBackend.BELEM), Accelerator(IBMQBackend.QUITO)]
+    circuits = [create_ghz(3), create_ghz(2), create_ghz(3).copy()]
+    expected = [
+        [acc.compute_processing_time(circuit, approximate=True) for circuit in circuits]
+        for acc in accelerators
+    ]
+    computed = []
+    compute_processing_time = Accelerator.compute_processing_time
+
+    def counting_compute(self, circuit, approximate=False):
+        computed.append(circuit)
+        return compute_processing_time(self, circuit, approximate)
+
+    monkeypatch.setattr(accelerator_module, "_processing_times", _LRUCache(16))
+    monkeypatch.setattr(Accelerator, "compute_processing_time", counting_compute)
+    times = Accelerator.compute_many(accelerators, circuits, approximate=True)
+    assert times.shape == (2, 3)                            # One row per accelerator
+    assert times.tolist() == expected                       # Same as computed directly
+    assert len(computed) == 4                               # Equal circuits run once